@@ -1,8 +1,20 @@
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
 from config import Config
+import json
 import os
+import sqlite3
+
+try:
+    # orjson's C encoder is several times faster than the stdlib json module
+    import orjson
+except ImportError:
+    orjson = None
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -10,10 +22,103 @@ login_manager = LoginManager()
 login_manager.login_view = 'auth.login'
 login_manager.login_message_category = 'info'
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes and decodes with orjson, used for jsonify()
+    and request.get_json() when orjson is installed.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand the encoded bytes to the response directly, skipping the
+        # str round trip of the base implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
+
+@event.listens_for(Engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection for many readers and one writer.
+
+    WAL lets the web app's reads run while the sensor service writes, and
+    synchronous=NORMAL only fsyncs at checkpoints, which is safe in WAL
+    mode (a power cut can lose the last commits but never corrupts the
+    database). The journal mode is stored in the database file, so
+    setting it again on later connections is a no-op.
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')  # 256 MB of address space, not RAM
+    cursor.close()
+
+def create_tables():
+    """
+    Create missing tables, plus any indexes added to existing tables since
+    they were created (db.create_all() skips tables that already exist).
+    Indexes the models no longer define are dropped so inserts stop
+    maintaining them.
+    """
+    db.create_all()
+    for table in db.metadata.tables.values():
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    with db.engine.begin() as conn:
+        # Superseded by the ix_sensor_readings_ts_cover covering index
+        conn.execute(text("DROP INDEX IF EXISTS ix_sensor_readings_timestamp"))
+    convert_legacy_user_ids()
+    convert_legacy_setting_values()
+
+def convert_legacy_user_ids():
+    """
+    Rewrite user ids stored as dashed 36-character UUID strings into the
+    32-character hex form the Uuid column type uses on databases without a
+    native UUID type. Rows already converted are left alone.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return
+    with db.engine.begin() as conn:
+        conn.execute(text("UPDATE users SET id = REPLACE(id, '-', '') WHERE id LIKE '%-%'"))
+
+def convert_legacy_setting_values():
+    """
+    JSON-encode system setting values saved as plain strings (such as
+    '06:00') before settings were stored as JSON, so reading them never
+    takes the decode-error fallback. Already-encoded rows are left alone.
+    """
+    with db.engine.begin() as conn:
+        rows = conn.execute(text("SELECT id, value FROM system_settings")).all()
+        for row_id, value in rows:
+            try:
+                json.loads(value)
+            except ValueError:
+                conn.execute(
+                    text("UPDATE system_settings SET value = :value WHERE id = :id"),
+                    {'value': json.dumps(value), 'id': row_id}
+                )
+
 def create_app(config_class=Config):
     # Create Flask app instance
     app = Flask(__name__)
     app.config.from_object(config_class)
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
+    # Keep compiled templates across restarts so workers skip parsing and
+    # compiling every template on first render. With no directory given,
+    # Jinja uses a private per-user folder under the system temp dir.
+    if app.config.get('JINJA_BYTECODE_CACHE'):
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
 
     # Initialize extensions
     db.init_app(app)
@@ -26,7 +131,14 @@ def create_app(config_class=Config):
     app.register_blueprint(auth)
 
     # Create database tables
-    with app.app_context():
-        db.create_all()
+    if app.config.get('AUTO_CREATE_TABLES', True):
+        with app.app_context():
+            create_tables()
+
+    @app.cli.command('init-db')
+    def init_db():
+        """Create any missing database tables."""
+        create_tables()
+        print('Database tables created.')
 
     return app
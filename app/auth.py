@@ -4,6 +4,8 @@ from app import db
 from app.models import User
 from app.forms import LoginForm, RegistrationForm
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 auth = Blueprint('auth', __name__)
 
@@ -27,6 +29,11 @@ def register():
             db.session.commit()
             flash('Registration successful! Please log in.', 'success')
             return redirect(url_for('auth.login'))
+        except IntegrityError:
+            # Unique constraints are the authoritative check if a concurrent
+            # signup slipped past the form validators
+            db.session.rollback()
+            flash('That username or email is already registered.', 'danger')
         except Exception as e:
             db.session.rollback()
             flash(f'An error {e} occurred. Please try again.', 'danger')
@@ -40,7 +47,9 @@ def login():
 
     form = LoginForm()
     if form.validate_on_submit():
-        user = User.query.filter_by(email=form.email.data).first()
+        user = db.session.execute(
+            select(User).where(User.email == form.email.data)
+        ).scalar_one_or_none()
 
         if user and user.check_password(form.password.data):
             login_user(user)
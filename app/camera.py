@@ -1,7 +1,34 @@
 import cv2
-from flask import Response
+import threading
 import time
 
+try:
+    # PyTurboJPEG talks to libjpeg-turbo directly, so encoding uses its SIMD
+    # (NEON on the Pi) paths regardless of how the OpenCV wheel was built
+    from turbojpeg import TurboJPEG, TJSAMP_420
+    _jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _jpeg = None
+
+# Encoding into a caller-supplied buffer (buffer_size() and encode(dst=...))
+# arrived in PyTurboJPEG 1.8; older releases allocate a new buffer per frame
+_jpeg_reuses_buffer = _jpeg is not None and hasattr(_jpeg, 'buffer_size')
+
+# Quality 75 with 4:2:0 chroma subsampling roughly halves frame size versus
+# the library defaults with no visible loss at 640x480
+JPEG_QUALITY = 75
+CV2_JPEG_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY,
+    cv2.IMWRITE_JPEG_SAMPLING_FACTOR, cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420,
+    cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+    cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+]
+
+# Multipart part header; the CRLF that closes the previous part is folded in
+# front of the boundary so each frame costs one small header plus the JPEG
+# bytes, with no concatenation of the frame itself
+FRAME_HEADER = b'\r\n--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+
 class Camera:
     """
     Singleton class to manage camera resources efficiently.
@@ -11,6 +38,7 @@ class Camera:
     _camera = None    # Class variable to hold the camera object
     _last_access = 0  # Timestamp of the last camera access
     _timeout = 10     # Timeout in seconds to auto-release camera when idle
+    _warmed_up = False  # Whether the one-time sensor warm-up has been done
     
     @classmethod
     def get_instance(cls):
@@ -31,6 +59,7 @@ class Camera:
         """
         if Camera._instance is not None:
             raise Exception("Camera class is a singleton!")
+        self._enc_buf = None  # Reusable JPEG output buffer for the re-encode fallback
         self._initialize_camera()
     
     def _initialize_camera(self):
@@ -38,6 +67,8 @@ class Camera:
         Sets up the camera with specific configuration parameters.
         Releases any existing camera connection before creating a new one.
         Configures resolution, framerate, and video format.
+        The one second warm-up only runs on the first open, so recovering
+        from a dropped camera mid-stream does not stall the feed.
         """
         if Camera._camera is not None:
             Camera._camera.release()
@@ -47,9 +78,16 @@ class Camera:
         Camera._camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)  # Set frame height
         Camera._camera.set(cv2.CAP_PROP_FPS, 24)            # Set frames per second
         Camera._camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M','J','P','G'))  # Set MJPEG format
+        Camera._camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)     # Hand back the raw MJPEG packet instead of decoded BGR
+        Camera._camera.set(cv2.CAP_PROP_FORMAT, -1)         # Request V4L2 raw mode as well, for builds that key off this
         
-        # Allow camera to initialize
-        time.sleep(1)
+        if not Camera._warmed_up:
+            # Allow camera to initialize on first open only
+            time.sleep(1)
+            Camera._warmed_up = True
+        elif Camera._camera.isOpened():
+            # On re-init skip the warm-up and just discard the first frame
+            Camera._camera.grab()
         
         if not Camera._camera.isOpened():
             raise RuntimeError("Could not initialize camera!")
@@ -59,6 +97,11 @@ class Camera:
         Captures a frame from the camera and returns it as JPEG-encoded bytes.
         Updates last access timestamp for timeout tracking.
         Handles camera errors by reinitializing when needed.
+
+        The camera already delivers MJPEG, so the compressed packet is passed
+        through as-is. Only drivers that ignore CAP_PROP_CONVERT_RGB and hand
+        back a decoded BGR image fall back to re-encoding, through libjpeg-turbo
+        when PyTurboJPEG is available and cv2.imencode otherwise.
         
         Returns:
             bytes: JPEG-encoded image data or None if capture failed
@@ -74,7 +117,24 @@ class Camera:
             time.sleep(0.5)
             return None
         
-        ret, buffer = cv2.imencode('.jpg', frame)  # Encode to JPEG format
+        if frame.ndim < 3:
+            # Raw MJPEG packet straight from V4L2, no decode/encode needed
+            return frame.tobytes()
+        
+        if _jpeg is not None:
+            if not _jpeg_reuses_buffer:
+                return _jpeg.encode(frame, quality=JPEG_QUALITY, jpeg_subsample=TJSAMP_420)
+            # Encode into a buffer sized once for the worst case and reused
+            # every frame, so only the final bytes copy allocates
+            if self._enc_buf is None:
+                self._enc_buf = bytearray(_jpeg.buffer_size(frame, jpeg_subsample=TJSAMP_420))
+            # The encoder hands back a new buffer instead of dst if it had
+            # to reallocate, so always slice the one it returns
+            buf, size = _jpeg.encode(frame, quality=JPEG_QUALITY, jpeg_subsample=TJSAMP_420,
+                                     dst=self._enc_buf)
+            return bytes(memoryview(buf)[:size])
+        
+        ret, buffer = cv2.imencode('.jpg', frame, CV2_JPEG_PARAMS)  # Encode to JPEG format
         if not ret:
             print("Failed to encode frame. Trying again...")
             return None
@@ -96,29 +156,129 @@ class Camera:
         """
         self.cleanup()
 
+class FrameBroker:
+    """
+    Shares a single camera capture loop between any number of viewers.
+
+    A background thread reads frames from the Camera singleton and publishes
+    the most recent one; every streaming client waits on that slot instead of
+    reading the camera itself, so capture cost does not grow with viewers.
+    The thread stops and releases the camera once the last viewer leaves.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None    # Latest JPEG frame
+        self._frame_id = 0    # Incremented for every published frame
+        self._viewers = 0     # Number of active streaming clients
+        self._thread = None   # Capture thread, None when not running
+
+    def subscribe(self):
+        """
+        Register a viewer and start the capture thread if needed.
+        """
+        with self._cond:
+            self._viewers += 1
+            self._ensure_running()
+
+    @property
+    def viewer_count(self):
+        """
+        Number of streaming clients currently subscribed.
+        """
+        with self._cond:
+            return self._viewers
+
+    def unsubscribe(self):
+        """
+        Unregister a viewer; the capture thread exits when none remain.
+        """
+        with self._cond:
+            self._viewers -= 1
+
+    def wait_for_frame(self, last_id, timeout=1.0):
+        """
+        Block until a frame newer than last_id is published.
+
+        Args:
+            last_id (int): Id of the last frame the caller has seen
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            tuple: (frame_id, frame_bytes); frame_id equals last_id on timeout
+        """
+        with self._cond:
+            self._ensure_running()
+            self._cond.wait_for(lambda: self._frame_id != last_id, timeout)
+            return self._frame_id, self._frame
+
+    def _ensure_running(self):
+        """
+        Start the capture thread if it is not running. Caller holds the lock.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._thread.start()
+
+    def _capture_loop(self):
+        """
+        Read frames from the camera and publish them until viewers leave
+        or the camera stops delivering frames.
+        """
+        camera = None
+        last_frame_time = time.monotonic()
+        try:
+            camera = Camera.get_instance()
+            while True:
+                with self._cond:
+                    if self._viewers <= 0:
+                        break
+
+                # read() blocks until the driver has a frame, so capture is
+                # paced by the camera's own frame rate
+                frame_bytes = camera.get_frame()
+                if frame_bytes is not None:
+                    with self._cond:
+                        self._frame = frame_bytes
+                        self._frame_id += 1
+                        self._cond.notify_all()
+                    last_frame_time = time.monotonic()
+                elif time.monotonic() - last_frame_time > Camera._timeout:
+                    # Release camera if it has stopped delivering frames for a while
+                    break
+        except Exception as e:
+            print(f"Error in frame capture loop: {e}")
+        finally:
+            with self._cond:
+                if camera is not None:
+                    camera.cleanup()
+                self._frame = None
+                self._thread = None
+                self._cond.notify_all()
+
+frame_broker = FrameBroker()
+
 def generate_frames():
     """
-    Generator function that captures continuous frames from the camera
-    and yields them in MJPEG format for streaming
+    Generator function that streams frames published by the shared
+    FrameBroker and yields them in MJPEG format, one generator per client
     """
-    camera = Camera.get_instance()
+    frame_broker.subscribe()
+    last_id = 0
+    last_yield_time = time.monotonic()
     
     try:
         while True:
-            frame_bytes = camera.get_frame()
-            if frame_bytes is not None:
-                # Format the frame as part of an MJPEG stream (multipart HTTP response)
-                yield b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n'
-            
-            # Small delay to control frame rate
-            time.sleep(0.04)  # ~25 fps
-            
-            # Release camera if not accessed for a while
-            if time.time() - Camera._last_access > Camera._timeout:
-                camera.cleanup()
+            frame_id, frame_bytes = frame_broker.wait_for_frame(last_id)
+            if frame_id != last_id:
+                last_id = frame_id
+                if frame_bytes is not None:
+                    # Emit the frame as part of an MJPEG stream (multipart HTTP response)
+                    yield FRAME_HEADER % len(frame_bytes)
+                    yield frame_bytes
+                    last_yield_time = time.monotonic()
+            elif time.monotonic() - last_yield_time > Camera._timeout:
+                # End the stream if no frames have arrived for a while
                 break
-    
-    except Exception as e:
-        print(f"Error in generate_frames: {e}")
-        camera.cleanup()
-        raise
+    finally:
+        frame_broker.unsubscribe()
@@ -26,25 +26,32 @@ import os
 from datetime import datetime, timedelta
 import time
 import RPi.GPIO as GPIO
-from sqlalchemy import func, and_
+from sqlalchemy import func, select
 from app import create_app, db
+from config import ServiceConfig
 from app.models import SensorReading, SystemSetting
-from app.routes import get_system_setting
+from app.routes import get_system_setting, minutes_since_midnight
 from app.utils.soil_sensor import SoilSensor
 
-# Configure logging system with rotation to manage file sizes
-log_dir = "/var/log/smart-garden"
-os.makedirs(log_dir, exist_ok=True)
-log_file = os.path.join(log_dir, "control-system.log")
-
 logger = logging.getLogger("smart-garden-control")
 logger.setLevel(logging.INFO)
 
-# Implement rotating logs: 10MB max size with 5 backup files
-handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=5)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+def _configure_logging():
+    """
+    Attach the rotating log file handler used by the control service.
+
+    Only called when this module runs as the service, so importing it does
+    not create the log directory or open the log file.
+    """
+    log_dir = "/var/log/smart-garden"
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, "control-system.log")
+
+    # Implement rotating logs: 10MB max size with 5 backup files
+    handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=5)
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
 
 class ControlSystem:
     """
@@ -76,7 +83,7 @@ class ControlSystem:
         logger.info(f"GPIO pins configured: Lights={self.LIGHT_RELAY_PIN}, Fan={self.FAN_RELAY_PIN}, Pump={self.PUMP_RELAY_PIN}")
 
         # Initialize Flask context for database operations
-        self.app = create_app()
+        self.app = create_app(ServiceConfig)
         self.app_context = self.app.app_context()
         self.app_context.push()
         logger.info("Flask app context created")
@@ -95,12 +102,38 @@ class ControlSystem:
         GPIO.output(self.LIGHT_RELAY_PIN, GPIO.LOW)
         GPIO.output(self.FAN_RELAY_PIN, GPIO.LOW)
         GPIO.output(self.PUMP_RELAY_PIN, GPIO.LOW)
+        # Shadow copy of the last state written to each relay, so the control
+        # loop never has to read the pins back
+        self._relay_state = {
+            self.LIGHT_RELAY_PIN: GPIO.LOW,
+            self.FAN_RELAY_PIN: GPIO.LOW,
+            self.PUMP_RELAY_PIN: GPIO.LOW,
+        }
         logger.debug("GPIO pins initialized to OFF state")
 
+    def set_relay(self, pin, on, name):
+        """
+        Drive a relay to the requested state, touching GPIO only on change.
+
+        Args:
+            pin (int): BCM pin number of the relay
+            on (bool): Whether the relay should be energized
+            name (str): Human-readable device name for logging
+        """
+        desired = GPIO.HIGH if on else GPIO.LOW
+        if self._relay_state[pin] != desired:
+            GPIO.output(pin, desired)
+            self._relay_state[pin] = desired
+            logger.info(f"{name} turned {'ON' if on else 'OFF'}")
+
     def get_average_readings(self, minutes=10):
         """
         Calculate average sensor readings over a specified time period.
 
+        All four averages come from one aggregate query; the window filter is
+        a range scan on the indexed SensorReading.timestamp column, so the
+        cost tracks the readings in the window rather than the table size.
+
         Args:
             minutes (int): Time window for averaging readings (default: 10)
 
@@ -109,18 +142,26 @@ class ControlSystem:
                              humidity, CO2, and moisture)
         """
         time_threshold = datetime.utcnow() - timedelta(minutes=minutes)
-        logger.debug(f"Getting average readings for past {minutes} minutes")
-
-        results = db.session.query(
-            func.avg(SensorReading.temperature).label('avg_temp'),
-            func.avg(SensorReading.humidity).label('avg_humidity'),
-            func.avg(SensorReading.co2).label('avg_co2'),
-            func.avg(SensorReading.moisture).label('avg_moisture')
-        ).filter(
-            SensorReading.timestamp >= time_threshold
+        logger.debug("Getting average readings for past %d minutes", minutes)
+
+        results = db.session.execute(
+            select(
+                func.avg(SensorReading.temperature).label('avg_temp'),
+                func.avg(SensorReading.humidity).label('avg_humidity'),
+                func.avg(SensorReading.co2).label('avg_co2'),
+                func.avg(SensorReading.moisture).label('avg_moisture')
+            ).where(
+                SensorReading.timestamp >= time_threshold
+            )
         ).first()
         
-        logger.debug(f"Average readings: Temp={results.avg_temp:.1f}, Humidity={results.avg_humidity:.1f}, CO2={results.avg_co2:.1f}, Moisture={results.avg_moisture:.1f}" if results.avg_temp is not None else "No readings available")
+        if logger.isEnabledFor(logging.DEBUG):
+            if results.avg_temp is not None:
+                logger.debug("Average readings: Temp=%.1f, Humidity=%.1f, CO2=%.1f, Moisture=%s",
+                             results.avg_temp, results.avg_humidity, results.avg_co2,
+                             f"{results.avg_moisture:.1f}" if results.avg_moisture is not None else "N/A")
+            else:
+                logger.debug("No readings available")
         return results
 
     def should_pump_be_on(self, avg_readings):
@@ -140,10 +181,10 @@ class ControlSystem:
             logger.debug("No moisture readings available, keeping pump off")
             return False
 
-        moisture_min = float(get_system_setting('moisture', 'min', default=30))
-        pump_duration = float(get_system_setting('moisture', 'pump_duration', default=60))
+        moisture_min = get_system_setting('moisture', 'min')
+        pump_duration = get_system_setting('moisture', 'pump_duration')
 
-        pump_is_running = GPIO.input(self.PUMP_RELAY_PIN)
+        pump_is_running = self._relay_state[self.PUMP_RELAY_PIN] == GPIO.HIGH
         current_time = time.time()
         
         if pump_is_running:
@@ -176,18 +217,20 @@ class ControlSystem:
         Returns:
             bool: True if lights should be on, False otherwise
         """
-        light_on_time = get_system_setting('light', 'on_time', default='06:00')
-        light_off_time = get_system_setting('light', 'off_time', default='20:00')
-        current_time = datetime.now().strftime('%H:%M')
-
-        if light_on_time <= light_off_time:
-            # Same-day schedule (e.g., 06:00 to 20:00)
-            result = light_on_time <= current_time <= light_off_time
-        else:
-            # Overnight schedule (e.g., 20:00 to 06:00)
-            result = current_time >= light_on_time or current_time <= light_off_time
+        light_on_time = get_system_setting('light', 'on_time')
+        light_off_time = get_system_setting('light', 'off_time')
+        now = datetime.now()
+
+        # Work in minutes since midnight; measuring both the current time and
+        # the off time relative to the on time handles same-day (06:00 to
+        # 20:00) and overnight (20:00 to 06:00) schedules the same way
+        on_minutes = minutes_since_midnight(light_on_time)
+        off_minutes = minutes_since_midnight(light_off_time)
+        current_minutes = now.hour * 60 + now.minute
+        result = (current_minutes - on_minutes) % 1440 <= (off_minutes - on_minutes) % 1440
                 
-        logger.debug(f"Light schedule decision: {'ON' if result else 'OFF'} (Current: {current_time}, On: {light_on_time}, Off: {light_off_time})")
+        logger.debug("Light schedule decision: %s (Current: %s, On: %s, Off: %s)",
+                     'ON' if result else 'OFF', now.strftime('%H:%M'), light_on_time, light_off_time)
         return result
 
     def should_fan_be_on(self, avg_readings):
@@ -208,9 +251,9 @@ class ControlSystem:
             return False
 
         # Retrieve threshold settings
-        temp_max = float(get_system_setting('temperature', 'max', default=75))
-        humid_max = float(get_system_setting('humidity', 'max', default=80))
-        co2_max = float(get_system_setting('co2', 'max', default=1500))
+        temp_max = get_system_setting('temperature', 'max')
+        humid_max = get_system_setting('humidity', 'max')
+        co2_max = get_system_setting('co2', 'max')
 
         # Check all environmental thresholds
         result = (
@@ -219,16 +262,18 @@ class ControlSystem:
             avg_readings.avg_co2 > co2_max
         )
         
-        # Log specific trigger conditions
-        trigger_reason = []
-        if avg_readings.avg_temp > temp_max:
-            trigger_reason.append(f"Temp {avg_readings.avg_temp:.1f} > {temp_max}")
-        if avg_readings.avg_humidity > humid_max:
-            trigger_reason.append(f"Humidity {avg_readings.avg_humidity:.1f}% > {humid_max}%")
-        if avg_readings.avg_co2 > co2_max:
-            trigger_reason.append(f"CO2 {avg_readings.avg_co2:.1f} > {co2_max}")
-                
-        logger.debug(f"Fan decision: {'ON' if result else 'OFF'}{' - Triggers: ' + ', '.join(trigger_reason) if result else ''}")
+        # Log specific trigger conditions, only building the list when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            trigger_reason = []
+            if avg_readings.avg_temp > temp_max:
+                trigger_reason.append(f"Temp {avg_readings.avg_temp:.1f} > {temp_max}")
+            if avg_readings.avg_humidity > humid_max:
+                trigger_reason.append(f"Humidity {avg_readings.avg_humidity:.1f}% > {humid_max}%")
+            if avg_readings.avg_co2 > co2_max:
+                trigger_reason.append(f"CO2 {avg_readings.avg_co2:.1f} > {co2_max}")
+
+            logger.debug("Fan decision: %s%s", 'ON' if result else 'OFF',
+                         ' - Triggers: ' + ', '.join(trigger_reason) if result else '')
         return result
 
     def control_systems(self):
@@ -244,28 +289,13 @@ class ControlSystem:
         avg_readings = self.get_average_readings()
 
         # Light control
-        light_status_before = GPIO.input(self.LIGHT_RELAY_PIN)
-        light_should_be_on = self.should_lights_be_on()
-        GPIO.output(self.LIGHT_RELAY_PIN, GPIO.HIGH if light_should_be_on else GPIO.LOW)
-                
-        if light_status_before != GPIO.input(self.LIGHT_RELAY_PIN):
-            logger.info(f"Lights turned {'ON' if light_should_be_on else 'OFF'}")
+        self.set_relay(self.LIGHT_RELAY_PIN, self.should_lights_be_on(), "Lights")
 
         # Fan control
-        fan_status_before = GPIO.input(self.FAN_RELAY_PIN)
-        fan_should_be_on = self.should_fan_be_on(avg_readings)
-        GPIO.output(self.FAN_RELAY_PIN, GPIO.HIGH if fan_should_be_on else GPIO.LOW)
-                
-        if fan_status_before != GPIO.input(self.FAN_RELAY_PIN):
-            logger.info(f"Fan turned {'ON' if fan_should_be_on else 'OFF'}")
+        self.set_relay(self.FAN_RELAY_PIN, self.should_fan_be_on(avg_readings), "Fan")
 
         # Pump control
-        pump_status_before = GPIO.input(self.PUMP_RELAY_PIN)
-        pump_should_be_on = self.should_pump_be_on(avg_readings)
-        GPIO.output(self.PUMP_RELAY_PIN, GPIO.HIGH if pump_should_be_on else GPIO.LOW)
-                
-        if pump_status_before != GPIO.input(self.PUMP_RELAY_PIN):
-            logger.info(f"Pump turned {'ON' if pump_should_be_on else 'OFF'}")
+        self.set_relay(self.PUMP_RELAY_PIN, self.should_pump_be_on(avg_readings), "Pump")
 
     def run(self):
         """
@@ -291,6 +321,7 @@ class ControlSystem:
             logger.info("App context popped, control system shutdown complete")
 
 if __name__ == '__main__':
+    _configure_logging()
     logger.info("=== Control System Service Starting ===")
     control_system = ControlSystem()
     control_system.run()
@@ -1,8 +1,36 @@
+import re
 from flask_wtf import FlaskForm
-from wtforms import StringField, PasswordField, SubmitField, FloatField, TimeField, SelectField, BooleanField, IntegerField, HiddenField
-from wtforms.validators import DataRequired, Length, Email, EqualTo, ValidationError, NumberRange, Optional
+from wtforms import StringField, PasswordField, SubmitField, FloatField, TimeField, BooleanField, IntegerField
+from wtforms.validators import DataRequired, Length, Regexp, EqualTo, ValidationError, NumberRange, Optional
+from app import db
 from app.models import User
+from sqlalchemy import exists, select
 from flask_login import current_user
+from flask import g
+
+# Syntax-only email check; avoids importing email_validator (and dnspython)
+# when the forms module loads. Compiled once and shared by every email field.
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+def _user_exists(**criteria):
+    """
+    Check whether a user matching the given column values exists.
+    Uses an EXISTS query and memoizes the answer on flask.g, so repeated
+    validation within one request does not hit the database again.
+    
+    Args:
+        **criteria: User column/value pairs to match (e.g. email=...)
+        
+    Returns:
+        bool: True if a matching user exists
+    """
+    cache = g.setdefault('_user_exists', {})
+    key = tuple(sorted(criteria.items()))
+    if key not in cache:
+        cache[key] = db.session.scalar(
+            select(exists().where(*(getattr(User, name) == value for name, value in criteria.items())))
+        )
+    return cache[key]
 
 class RegistrationForm(FlaskForm):
     """
@@ -19,7 +47,7 @@ class RegistrationForm(FlaskForm):
     email = StringField('Email',
         validators=[
             DataRequired(),
-            Email(message="Invalid email address")
+            Regexp(EMAIL_RE, message="Invalid email address")
         ])
     password = PasswordField('Password',
         validators=[
@@ -44,8 +72,7 @@ class RegistrationForm(FlaskForm):
         Raises:
             ValidationError: If username is already taken
         """
-        user = User.query.filter_by(username=username.data).first()
-        if user:
+        if _user_exists(username=username.data):
             raise ValidationError('That username is already taken.')
 
     def validate_email(self, email):
@@ -59,8 +86,7 @@ class RegistrationForm(FlaskForm):
         Raises:
             ValidationError: If email is already registered
         """
-        user = User.query.filter_by(email=email.data).first()
-        if user:
+        if _user_exists(email=email.data):
             raise ValidationError('That email is already registered.')
 
 class LoginForm(FlaskForm):
@@ -71,7 +97,7 @@ class LoginForm(FlaskForm):
     email = StringField('Email',
         validators=[
             DataRequired(),
-            Email(message="Invalid email address")
+            Regexp(EMAIL_RE, message="Invalid email address")
         ])
     password = PasswordField('Password',
         validators=[DataRequired()])
@@ -182,7 +208,7 @@ class UserSettingsForm(FlaskForm):
     email = StringField('Email Address', 
         validators=[
             DataRequired(),
-            Email(message="Please enter a valid email address")
+            Regexp(EMAIL_RE, message="Please enter a valid email address")
         ])
     new_password = PasswordField('New Password',
         validators=[
@@ -208,6 +234,5 @@ class UserSettingsForm(FlaskForm):
             ValidationError: If new email is already registered to another user
         """
         if email.data != current_user.email:  # Only check if email is being changed
-            user = User.query.filter_by(email=email.data).first()
-            if user:
+            if _user_exists(email=email.data):
                 raise ValidationError('That email is already registered.')
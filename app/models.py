@@ -2,13 +2,32 @@ from app import db, login_manager
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy.sql import func
+import hashlib
+import hmac
+import os
+import threading
+import time
 import uuid
 from datetime import datetime
 
+# scrypt with N=2**14 (16 MB, about half werkzeug's default cost) keeps a
+# login check near 100 ms on a Raspberry Pi. Stored hashes embed their own
+# parameters, so changing this only affects newly set passwords.
+PASSWORD_HASH_METHOD = 'scrypt:16384:8:1'
+
+# Successful password checks, keyed on (user id, stored hash, keyed digest of
+# the candidate password) -> expiry, so repeat logins skip the KDF for a
+# short while. The digest key is random per process and never stored.
+PASSWORD_CHECK_CACHE_TTL = 60  # seconds
+_password_check_cache = {}
+_password_check_lock = threading.Lock()  # Guards eviction against concurrent logins
+_password_cache_key = os.urandom(32)
+
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Native UUID on PostgreSQL, 32-character hex elsewhere
+    id = db.Column(db.Uuid, primary_key=True, default=uuid.uuid4)
     username = db.Column(db.String(50), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
@@ -16,27 +35,62 @@ class User(UserMixin, db.Model):
     last_login = db.Column(db.DateTime(timezone=True), nullable=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        # Cached checks are keyed on the hash, so ones against the old
+        # password can no longer match and simply expire
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """
+        Verify a password against the stored hash.
+
+        Only successful checks are cached, for PASSWORD_CHECK_CACHE_TTL
+        seconds; failed attempts always pay the full scrypt cost.
+        """
+        digest = hmac.new(_password_cache_key, password.encode('utf-8'), hashlib.sha256).digest()
+        cache_key = (self.id, self.password_hash, digest)
+        now = time.monotonic()
+        expiry = _password_check_cache.get(cache_key)
+        if expiry is not None and expiry > now:
+            return True
+
+        if not check_password_hash(self.password_hash, password):
+            return False
+        with _password_check_lock:
+            # Evict expired checks so the cache stays bounded by recent logins
+            for key, key_expiry in list(_password_check_cache.items()):
+                if key_expiry <= now:
+                    del _password_check_cache[key]
+            _password_check_cache[cache_key] = now + PASSWORD_CHECK_CACHE_TTL
+        return True
 
     def __repr__(self):
         return f'<User {self.username}>'
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(user_id)
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        return None
+    return db.session.get(User, user_uuid)
 
 class SensorReading(db.Model):
     __tablename__ = 'sensor_readings'
 
     id = db.Column(db.Integer, primary_key=True)
-    timestamp = db.Column(db.DateTime(timezone=True), index=True, default=datetime.utcnow)
-    co2 = db.Column(db.Float, nullable=False)
-    temperature = db.Column(db.Float, nullable=False)
-    humidity = db.Column(db.Float, nullable=False)
-    moisture = db.Column(db.Float, nullable=True)
+    timestamp = db.Column(db.DateTime(timezone=True), default=datetime.utcnow)
+    # Single precision is ample for sensor values: Float(24) is a 4-byte
+    # real on PostgreSQL (SQLite stores every float in 8 bytes regardless)
+    co2 = db.Column(db.Float(precision=24), nullable=False)
+    temperature = db.Column(db.Float(precision=24), nullable=False)
+    humidity = db.Column(db.Float(precision=24), nullable=False)
+    moisture = db.Column(db.Float(precision=24), nullable=True)
+
+    # Covering index: time-window queries (chart data, control averages)
+    # are answered from the index alone without visiting table rows
+    __table_args__ = (
+        db.Index('ix_sensor_readings_ts_cover', 'timestamp', 'temperature', 'humidity', 'co2', 'moisture'),
+    )
 
     def __repr__(self):
         return f'<SensorReading {self.timestamp}: CO2={self.co2}ppm, Temp={self.temperature}°F, Humidity={self.humidity}, Moisture={self.moisture}%>'
@@ -1,17 +1,118 @@
-from flask import Blueprint, render_template, redirect, jsonify, flash, request, url_for
+from flask import Blueprint, render_template, redirect, jsonify, flash, request, url_for, g, abort, current_app, has_request_context
 from datetime import datetime, timedelta
 import json
+import time
+from functools import lru_cache
+from types import SimpleNamespace
 from flask_login import login_required, current_user
 from app.models import SensorReading, SystemSetting
-from sqlalchemy import func
+from sqlalchemy import event, func, lambda_stmt, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from flask import Response
-from app.camera import generate_frames
 from app.forms import TemperatureSettingsForm, HumiditySettingsForm, CO2SettingsForm, LightSettingsForm, UserSettingsForm, MoistureSettingsForm
 from app import db
+from app.utils.readings_signal import readings_signal_stamp
 
 # Create a Blueprint named 'main' for route organization
 main = Blueprint('main', __name__)
 
+# In-process cache of parsed settings: (setting_type, key) -> (expiry, value)
+SETTING_CACHE_TTL = 30  # seconds
+_setting_cache = {}
+_MISSING = object()  # Cached marker for settings that are not in the database
+_UNCACHED = object()  # Lookup result for settings with no live cache entry
+
+# Value used for each setting until one is saved; the single source of
+# defaults for the views, the settings forms and the control service.
+# Every setting must be registered here: saving an unregistered setting
+# raises ValueError and reading an unsaved one raises KeyError.
+SETTING_DEFAULTS = {
+    ('temperature', 'min'): 65,
+    ('temperature', 'max'): 75,
+    ('humidity', 'min'): 40,
+    ('humidity', 'max'): 80,
+    ('co2', 'min'): 400,
+    ('co2', 'max'): 1500,
+    ('light', 'on_time'): '06:00',
+    ('light', 'off_time'): '20:00',
+    ('moisture', 'min'): 30,
+    ('moisture', 'pump_duration'): 60,
+    ('user', 'alerts_enabled'): True,
+}
+
+# The same defaults per category, as a base for settings groups
+_GROUP_DEFAULTS = {}
+for (_type, _key), _value in SETTING_DEFAULTS.items():
+    _GROUP_DEFAULTS.setdefault(_type, {})[_key] = _value
+
+# Settings behind the equipment status shown on the dashboard
+STATUS_SETTINGS = (
+    ('temperature', 'max'),
+    ('humidity', 'max'),
+    ('moisture', 'min'),
+    ('light', 'on_time'),
+    ('light', 'off_time'),
+)
+
+@event.listens_for(SystemSetting, 'after_insert')
+@event.listens_for(SystemSetting, 'after_update')
+@event.listens_for(SystemSetting, 'after_delete')
+def _invalidate_setting_cache(mapper, connection, target):
+    """
+    Drop the cached value for any SystemSetting row written through the ORM,
+    including writes that do not go through save_system_setting.
+    """
+    _forget_setting(target.setting_type, target.key)
+
+def _forget_setting(setting_type, key):
+    """
+    Drop one setting, and the cached group of its category, from the
+    in-process cache. Other categories stay cached.
+    """
+    _setting_cache.pop((setting_type, key), None)
+    _setting_cache.pop((setting_type, None), None)
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO UPDATE
+_DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+# Latest sensor reading shared across requests: (expiry, signal stamp,
+# reading snapshot). The sensor service takes a reading every 30 seconds and
+# commits them two at a time, so new rows land about once a minute; 15
+# seconds matches the dashboard's poll interval and keeps the staleness well
+# under one write.
+READING_CACHE_TTL = 15  # seconds
+# After each commit the sensor service touches the readings signal file
+# (see app.utils.readings_signal), and a changed mtime drops the cached
+# reading at once. While the signal file exists the TTL is only a safety net.
+READING_SIGNAL_TTL = 300  # seconds
+_reading_cache = (0, None, None)
+# Built once as a lambda statement: the lambda is analyzed on first use and
+# later executions go straight to the compiled-statement cache
+_LATEST_READING_STMT = lambda_stmt(lambda: select(
+    SensorReading.id,
+    SensorReading.timestamp,
+    SensorReading.co2,
+    SensorReading.temperature,
+    SensorReading.humidity,
+    SensorReading.moisture,
+).order_by(SensorReading.timestamp.desc()).limit(1))
+
+# Last rendered /current-readings partial: ((reading id, lights_on, fan_on,
+# pump_on), html, etag)
+_readings_partial = (None, None, None)
+
+# SQL expressions that format a timestamp as its 'YYYY-MM-DD HH:00' hour
+_HOUR_BUCKETS = {
+    'sqlite': lambda ts: func.strftime('%Y-%m-%d %H:00', ts),
+    'postgresql': lambda ts: func.to_char(ts, 'YYYY-MM-DD HH24:00'),
+}
+
+# Seconds the browser may reuse /api/chart-data without revalidating
+CHART_DATA_MAX_AGE = 60
+
 @main.route('/')
 @login_required
 def index():
@@ -36,31 +137,10 @@ def dashboard():
     Requires user authentication.
     """
     # Get the latest sensor reading
-    reading = SensorReading.query.order_by(SensorReading.timestamp.desc()).first()
+    reading = latest_reading()
 
     # Get statuses for indicators fan, lights, and pump
-    light_on_time = get_system_setting('light', 'on_time', default='06:00')
-    light_off_time = get_system_setting('light', 'off_time', default='20:00')
-    fan_on_temp = get_system_setting('temperature', 'max', default=75)  # Turn on when above this
-    fan_on_humidity = get_system_setting('humidity', 'max', default=70) 
-    pump_on_moisture = get_system_setting('moisture', 'min', default=30)  # Turn on when below this
-
-    # Convert current time and settings to comparable format
-    current_time = datetime.now().strftime('%H:%M')
-    
-    fan_on = False
-    pump_on = False
-    if reading:
-        fan_on = (reading.temperature > fan_on_temp) or (reading.humidity > fan_on_humidity)
-        pump_on = reading.moisture < pump_on_moisture
-
-    # Check if lights should be on
-    if light_on_time <= light_off_time:
-        # Simple case: on_time is before off_time in the same day
-        lights_on = light_on_time <= current_time <= light_off_time
-    else:
-        # Complex case: on_time is after off_time (spans midnight)
-        lights_on = current_time >= light_on_time or current_time <= light_off_time
+    lights_on, fan_on, pump_on = device_status(reading)
 
     return render_template('dashboard.html',
                         current_user=current_user,
@@ -80,11 +160,38 @@ def video_feed():
     Returns a multipart HTTP response that continuously streams 
     camera frames for viewing in the web interface.
     Requires user authentication.
+    
+    The camera module (and OpenCV with it) is imported on the first request
+    rather than at startup, and the route returns 404 when CAMERA_ENABLED
+    is off. Returns 503 once MAX_STREAM_VIEWERS streams are open.
     """
-    return Response(
+    if not current_app.config.get('CAMERA_ENABLED', True):
+        abort(404)
+
+    from app.camera import generate_frames, frame_broker
+
+    # Each stream holds a worker thread for as long as it is open; refuse new
+    # viewers past the limit so API polls always have threads left. The
+    # check is not atomic with the subscribe, so a burst can overshoot by a
+    # viewer or two, which is harmless.
+    max_viewers = current_app.config.get('MAX_STREAM_VIEWERS')
+    if max_viewers and frame_broker.viewer_count >= max_viewers:
+        response = Response('Too many video viewers, try again shortly.', status=503)
+        response.headers['Retry-After'] = '10'
+        return response
+
+    # Each frame is yielded as soon as the broker publishes it. A client whose
+    # socket is slow simply picks up the newest frame on its next wait, so
+    # frames are skipped rather than queued. Tell nginx not to buffer the
+    # stream and browsers/proxies not to cache it.
+    response = Response(
         generate_frames(),
-        mimetype='multipart/x-mixed-replace; boundary=frame'
+        mimetype='multipart/x-mixed-replace; boundary=frame',
+        direct_passthrough=True
     )
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Cache-Control'] = 'no-cache, no-store'
+    return response
 
 @main.route('/settings')
 @login_required
@@ -103,32 +210,10 @@ def settings():
     Organizes them into a structured dictionary for the template.
     Requires user authentication.
     """
-    current_settings = {
-        'temperature': {
-            'min': get_system_setting('temperature', 'min', default=65),
-            'max': get_system_setting('temperature', 'max', default=75)
-        },
-        'humidity': {
-            'min': get_system_setting('humidity', 'min', default=40),
-            'max': get_system_setting('humidity', 'max', default=80)
-        },
-        'co2': {
-            'min': get_system_setting('co2', 'min', default=400),
-            'max': get_system_setting('co2', 'max', default=1500)
-        },
-        'light': {
-            'on_time': get_system_setting('light', 'on_time', default='06:00'),
-            'off_time': get_system_setting('light', 'off_time', default='20:00')
-        },
-        'user': {
-            'email': current_user.email,
-            'alerts_enabled': get_system_setting('user', 'alerts_enabled', default='true')
-        },
-        'moisture': {
-            'min': get_system_setting('moisture', 'min', default='30'),
-    	    'pump_duration': get_system_setting('moisture', 'pump_duration', default='60')
-	}
-    }
+    # Each group already carries the defaults for keys never saved
+    current_settings = get_settings_groups('temperature', 'humidity', 'co2', 'light', 'user', 'moisture')
+    # Copy rather than modify the cached user group
+    current_settings['user'] = dict(current_settings['user'], email=current_user.email)
 
     return render_template('settings/index.html', 
                          current_settings=current_settings)
@@ -150,12 +235,14 @@ def temperature_settings():
     if form.validate_on_submit():
         save_system_setting('temperature', 'min', form.temp_min.data)
         save_system_setting('temperature', 'max', form.temp_max.data)
-        flash('Temperature settings updated successfully!', 'success')
-        return redirect(url_for('main.temperature_settings'))
+        return _settings_saved('Temperature settings updated successfully!', 'main.temperature_settings')
+    if request.is_json:
+        return jsonify(errors=form.errors), 400
 
     # Load current settings
-    form.temp_min.data = get_system_setting('temperature', 'min', default=65)
-    form.temp_max.data = get_system_setting('temperature', 'max', default=75)
+    temperature = get_settings_group('temperature')
+    form.temp_min.data = temperature['min']
+    form.temp_max.data = temperature['max']
     
     return render_template('settings/temperature.html', form=form)
 
@@ -176,12 +263,14 @@ def humidity_settings():
     if form.validate_on_submit():
         save_system_setting('humidity', 'min', form.humidity_min.data)
         save_system_setting('humidity', 'max', form.humidity_max.data)
-        flash('Humidity settings updated successfully!', 'success')
-        return redirect(url_for('main.humidity_settings'))
+        return _settings_saved('Humidity settings updated successfully!', 'main.humidity_settings')
+    if request.is_json:
+        return jsonify(errors=form.errors), 400
 
     # Load current settings
-    form.humidity_min.data = get_system_setting('humidity', 'min', default=40)
-    form.humidity_max.data = get_system_setting('humidity', 'max', default=80)
+    humidity = get_settings_group('humidity')
+    form.humidity_min.data = humidity['min']
+    form.humidity_max.data = humidity['max']
     
     return render_template('settings/humidity.html', form=form)
 
@@ -202,12 +291,14 @@ def co2_settings():
     if form.validate_on_submit():
         save_system_setting('co2', 'min', form.co2_min.data)
         save_system_setting('co2', 'max', form.co2_max.data)
-        flash('CO2 settings updated successfully!', 'success')
-        return redirect(url_for('main.co2_settings'))
+        return _settings_saved('CO2 settings updated successfully!', 'main.co2_settings')
+    if request.is_json:
+        return jsonify(errors=form.errors), 400
 
     # Load current settings
-    form.co2_min.data = get_system_setting('co2', 'min', default=400)
-    form.co2_max.data = get_system_setting('co2', 'max', default=1800)
+    co2 = get_settings_group('co2')
+    form.co2_min.data = co2['min']
+    form.co2_max.data = co2['max']
     
     return render_template('settings/co2.html', form=form)
 
@@ -233,15 +324,16 @@ def light_settings():
         
         save_system_setting('light', 'on_time', on_time)
         save_system_setting('light', 'off_time', off_time)
-        flash('Light schedule updated successfully!', 'success')
-        return redirect(url_for('main.light_settings'))
+        return _settings_saved('Light schedule updated successfully!', 'main.light_settings')
+    if request.is_json:
+        return jsonify(errors=form.errors), 400
 
     # Load current settings
-    on_time_str = get_system_setting('light', 'on_time', default='06:00')
-    off_time_str = get_system_setting('light', 'off_time', default='20:00')
+    light = get_settings_group('light')
+    on_time_str = light['on_time']
+    off_time_str = light['off_time']
     
     # Convert string times to time objects for the form
-    from datetime import datetime
     form.light_on_time.data = datetime.strptime(on_time_str, '%H:%M').time()
     form.light_off_time.data = datetime.strptime(off_time_str, '%H:%M').time()
 
@@ -265,12 +357,14 @@ def moisture_settings():
     if form.validate_on_submit():
         save_system_setting('moisture', 'min', form.moisture_min.data)
         save_system_setting('moisture', 'pump_duration', form.pump_duration.data)
-        flash('Moisture settings updated successfully!', 'success')
-        return redirect(url_for('main.moisture_settings'))
+        return _settings_saved('Moisture settings updated successfully!', 'main.moisture_settings')
+    if request.is_json:
+        return jsonify(errors=form.errors), 400
 
     # Load current settings
-    form.moisture_min.data = get_system_setting('moisture', 'min', default=30)
-    form.pump_duration.data = get_system_setting('moisture', 'pump_duration', default=60)
+    moisture = get_settings_group('moisture')
+    form.moisture_min.data = moisture['min']
+    form.pump_duration.data = moisture['pump_duration']
     
     return render_template('settings/moisture.html', form=form)
 
@@ -305,17 +399,65 @@ def user_settings():
             flash('Password updated successfully!', 'success')
 
         # Handle alert settings
-        save_system_setting('user', 'alerts_enabled', 
-                          'true' if form.enable_alerts.data else 'false')
+        save_system_setting('user', 'alerts_enabled', bool(form.enable_alerts.data))
 
         db.session.commit()
         return redirect(url_for('main.user_settings'))
 
     # Load current settings
     form.email.data = current_user.email
-    form.enable_alerts.data = get_system_setting('user', 'alerts_enabled', default='true')
+    form.enable_alerts.data = get_system_setting('user', 'alerts_enabled')
     return render_template('settings/user.html', form=form)
 
+def _settings_saved(message, endpoint):
+    """
+    Respond to a successful settings form submission.
+    
+    Args:
+        message (str): Confirmation message for the user
+        endpoint (str): Settings page to redirect back to
+    
+    Returns:
+        JSON {'message': ...} when the form was posted as JSON by
+        settings-form.js, otherwise a flash message and a redirect to the
+        settings page.
+    """
+    if request.is_json:
+        return jsonify(message=message)
+    flash(message, 'success')
+    return redirect(url_for(endpoint))
+
+def latest_reading():
+    """
+    Get the most recent sensor reading, memoized for the current request.
+    
+    Across requests the reading is cached in-process as a plain attribute
+    snapshot, so it can outlive the database session it was loaded in. The
+    cache is dropped as soon as the sensor service signals a new commit
+    (one stat() per request), and otherwise expires after READING_CACHE_TTL
+    seconds, or READING_SIGNAL_TTL while the signal file exists.
+    
+    Returns:
+        SimpleNamespace: Snapshot of the newest reading (same attributes as
+        SensorReading), or None if there are none yet.
+    """
+    global _reading_cache
+    if 'latest_reading' not in g:
+        now = time.monotonic()
+        stamp = readings_signal_stamp()
+        expiry, cached_stamp, reading = _reading_cache
+        if expiry <= now or stamp != cached_stamp:
+            # Plain column select with LIMIT 1: answered by a backward scan of
+            # the timestamp covering index, without building an ORM object
+            row = db.session.execute(
+                _LATEST_READING_STMT
+            ).first()
+            reading = SimpleNamespace(**row._asdict()) if row else None
+            ttl = READING_CACHE_TTL if stamp is None else READING_SIGNAL_TTL
+            _reading_cache = (now + ttl, stamp, reading)
+        g.latest_reading = reading
+    return g.latest_reading
+
 def save_system_setting(setting_type, key, value):
     """
     Save a system-wide setting to the database.
@@ -323,61 +465,303 @@ def save_system_setting(setting_type, key, value):
     Args:
         setting_type (str): Category of setting (temperature, humidity, etc.)
         key (str): Specific setting name within the category
-        value (any): Value to store (will be converted to string)
+        value (any): JSON-serializable value to store (number, bool or str)
+    
+    On SQLite and PostgreSQL the setting is inserted or updated in a single
+    INSERT ... ON CONFLICT DO UPDATE statement against the
+    (setting_type, key) unique constraint. Other databases look the row up
+    and update or insert it through the ORM. Either way the change is
+    committed.
     
-    Creates a new setting record if it doesn't exist, otherwise updates existing record.
-    Commits the change to the database.
+    Raises:
+        ValueError: If the setting has no SETTING_DEFAULTS entry
     """
-    # Check if setting exists
-    setting = SystemSetting.query.filter_by(
-        setting_type=setting_type,
-        key=key
-    ).first()
-
-    if setting:
-        # Update existing setting
-        setting.value = str(value)
-    else:
-        # Create new setting
-        setting = SystemSetting(
+    if (setting_type, key) not in SETTING_DEFAULTS:
+        raise ValueError(f"Setting {setting_type}.{key} has no entry in SETTING_DEFAULTS")
+    insert = _DIALECT_INSERTS.get(db.engine.dialect.name)
+    if insert is not None:
+        stmt = insert(SystemSetting).values(
             setting_type=setting_type,
             key=key,
-            value=str(value)
+            value=json.dumps(value)
         )
-        db.session.add(setting)
-
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['setting_type', 'key'],
+            set_={'value': stmt.excluded.value, 'updated_at': func.now()}
+        )
+        db.session.execute(stmt)
+    else:
+        setting = db.session.execute(
+            select(SystemSetting).filter_by(setting_type=setting_type, key=key)
+        ).scalar_one_or_none()
+        if setting:
+            setting.value = json.dumps(value)
+        else:
+            db.session.add(SystemSetting(
+                setting_type=setting_type,
+                key=key,
+                value=json.dumps(value)
+            ))
     db.session.commit()
+    # The Core upsert does not fire the mapper events, so invalidate here
+    # (repeating it after an ORM save is harmless)
+    _forget_setting(setting_type, key)
+    if has_request_context():
+        g.get('_settings', {}).pop((setting_type, key), None)
 
-def get_system_setting(setting_type, key, default=None):
+def get_system_setting(setting_type, key):
     """
     Get a system-wide setting from the database.
     
     Args:
         setting_type (str): Category of setting (temperature, humidity, etc.)
         key (str): Specific setting name within the category
-        default (any): Default value to return if setting doesn't exist
     
     Returns:
-        The setting value converted to appropriate type (float, boolean, or string),
-        or the default value if setting doesn't exist.
-    """
-    setting = SystemSetting.query.filter_by(
-        setting_type=setting_type,
-        key=key
-    ).first()
-
-    if setting:
-        # Try to convert to the appropriate type
-        try:
-            # First try to convert to float
-            return float(setting.value)
-        except ValueError:
-            # If that fails, check if it's a boolean
-            if setting.value.lower() in ('true', 'false'):
-                return setting.value.lower() == 'true'
-            # Otherwise return as string
-            return setting.value
-    return default
+        The setting value with the type it was saved with (number, boolean,
+        or string), or its SETTING_DEFAULTS entry if it has not been saved.
+    
+    Values are cached in-process for SETTING_CACHE_TTL seconds and memoized
+    per request on flask.g; fetch several at once with get_system_settings_bulk.
+    """
+    cache_key = (setting_type, key)
+    # Only memoize on g inside a request: the control service keeps one app
+    # context open for its whole run, so g there would never be reset
+    request_cache = g.setdefault('_settings', {}) if has_request_context() else {}
+    value = request_cache.get(cache_key, _UNCACHED)
+    if value is _UNCACHED:
+        now = time.monotonic()
+        value = _cached_setting(setting_type, key, now)
+        if value is _UNCACHED:
+            # lambda_stmt caches the statement by code location and binds
+            # setting_type/key as parameters, skipping construction and
+            # cache-key generation on every call. Only the value column is
+            # fetched; the unique (setting_type, key) constraint guarantees
+            # at most one row.
+            raw_value = db.session.execute(lambda_stmt(
+                lambda: select(SystemSetting.value).where(
+                    SystemSetting.setting_type == setting_type,
+                    SystemSetting.key == key
+                )
+            )).scalar_one_or_none()
+
+            value = _parse_setting_value(raw_value) if raw_value is not None else _MISSING
+            _setting_cache[cache_key] = (now + SETTING_CACHE_TTL, value)
+        request_cache[cache_key] = value
+    return SETTING_DEFAULTS[cache_key] if value is _MISSING else value
+
+def get_system_settings_bulk(pairs):
+    """
+    Get several system-wide settings with at most one query.
+    
+    Args:
+        pairs (iterable): (setting_type, key) tuples to look up
+    
+    Returns:
+        dict: (setting_type, key) to parsed value for every requested pair;
+        pairs not stored in the database map to their SETTING_DEFAULTS
+        entry.
+    
+    Settings already in the in-process cache are served from it; the rest
+    are fetched together with a single (setting_type, key) IN query and
+    cached individually, so later get_system_setting calls for the same
+    keys are cache hits.
+    """
+    now = time.monotonic()
+    values = {}
+    misses = []
+    for pair in pairs:
+        value = _cached_setting(pair[0], pair[1], now)
+        if value is _UNCACHED:
+            misses.append(pair)
+        else:
+            values[pair] = SETTING_DEFAULTS[pair] if value is _MISSING else value
+
+    if misses:
+        rows = db.session.execute(
+            select(SystemSetting.setting_type, SystemSetting.key, SystemSetting.value).where(
+                tuple_(SystemSetting.setting_type, SystemSetting.key).in_(misses)
+            )
+        )
+        fetched = {
+            (setting_type, key): _parse_setting_value(value)
+            for setting_type, key, value in rows
+        }
+        for pair in misses:
+            value = fetched.get(pair, _MISSING)
+            _setting_cache[pair] = (now + SETTING_CACHE_TTL, value)
+            values[pair] = SETTING_DEFAULTS[pair] if value is _MISSING else value
+    return values
+
+def _cached_setting(setting_type, key, now):
+    """
+    Look up a setting in the in-process cache.
+    
+    Args:
+        setting_type (str): Category of setting
+        key (str): Setting name within the category
+        now (float): Current time.monotonic() value
+    
+    Returns:
+        The cached value, _MISSING if the setting is cached as absent, or
+        _UNCACHED if there is no live cache entry for it. A cached group
+        for the whole category counts as an entry.
+    """
+    cached = _setting_cache.get((setting_type, key)) or _setting_cache.get((setting_type, None))
+    if cached is None or cached[0] <= now:
+        return _UNCACHED
+    value = cached[1]
+    if isinstance(value, dict):
+        # Whole category is cached
+        return value.get(key, _MISSING)
+    return value
+
+def get_settings_group(setting_type):
+    """
+    Get every setting of one category with a single query.
+    
+    Args:
+        setting_type (str): Category of setting (temperature, humidity, etc.)
+    
+    Returns:
+        dict: Setting key to parsed value, starting from the category's
+        SETTING_DEFAULTS and overlaid with the keys stored in the database.
+        Shares the get_system_setting cache; callers must not modify it.
+    """
+    cache_key = (setting_type, None)
+    cached = _setting_cache.get(cache_key)
+    now = time.monotonic()
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    rows = db.session.execute(
+        select(SystemSetting.key, SystemSetting.value).filter_by(setting_type=setting_type)
+    )
+    group = dict(_GROUP_DEFAULTS.get(setting_type, {}))
+    group.update((key, _parse_setting_value(value)) for key, value in rows)
+    _setting_cache[cache_key] = (now + SETTING_CACHE_TTL, group)
+    return group
+
+def get_settings_groups(*setting_types):
+    """
+    Get every setting of several categories with at most one query.
+    
+    Args:
+        *setting_types (str): Categories to load (temperature, humidity, etc.)
+    
+    Returns:
+        dict: Category to the dict get_settings_group would return for it.
+        Categories not in the cache are loaded together with a single
+        setting_type IN query.
+    """
+    now = time.monotonic()
+    groups = {}
+    misses = []
+    for setting_type in setting_types:
+        cached = _setting_cache.get((setting_type, None))
+        if cached is not None and cached[0] > now:
+            groups[setting_type] = cached[1]
+        else:
+            groups[setting_type] = dict(_GROUP_DEFAULTS.get(setting_type, {}))
+            misses.append(setting_type)
+
+    if misses:
+        # Plain columns rather than SystemSetting entities: nothing here
+        # needs identity-map tracking
+        rows = db.session.execute(
+            select(SystemSetting.setting_type, SystemSetting.key, SystemSetting.value)
+            .where(SystemSetting.setting_type.in_(misses))
+        )
+        for setting_type, key, value in rows:
+            groups[setting_type][key] = _parse_setting_value(value)
+        for setting_type in misses:
+            _setting_cache[(setting_type, None)] = (now + SETTING_CACHE_TTL, groups[setting_type])
+    return groups
+
+@lru_cache(maxsize=64)
+def minutes_since_midnight(hhmm):
+    """
+    Convert an 'HH:MM' schedule string to minutes since midnight.
+    
+    Results are memoized, since the same few schedule strings are parsed
+    on every status check.
+    
+    Args:
+        hhmm (str): Time of day in 24-hour 'HH:MM' format
+    
+    Returns:
+        int: Minutes elapsed since 00:00
+    """
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+def lights_on_now():
+    """
+    Check whether the grow lights are scheduled to be on right now.
+    
+    Reads the light schedule through the settings cache and compares
+    minute-of-day integers. Measuring both the current time and
+    the off time relative to the on time handles same-day (06:00 to 20:00)
+    and overnight (20:00 to 06:00) schedules the same way.
+    
+    Returns:
+        bool: True if the current time is within the on/off window
+    """
+    on_minutes = minutes_since_midnight(get_system_setting('light', 'on_time'))
+    off_minutes = minutes_since_midnight(get_system_setting('light', 'off_time'))
+    now = datetime.now()
+    current_minutes = now.hour * 60 + now.minute
+    return (current_minutes - on_minutes) % 1440 <= (off_minutes - on_minutes) % 1440
+
+def device_status(reading):
+    """
+    Work out the light, fan and pump indicators shown on the dashboard.
+    
+    Shared by the dashboard page and the current-readings partial so both
+    always agree. All thresholds come from one bulk settings lookup.
+    
+    Args:
+        reading: Latest sensor reading snapshot, or None
+    
+    Returns:
+        tuple: (lights_on, fan_on, pump_on) booleans. The fan and pump are
+        reported off when there is no reading, and a sensor value missing
+        from the reading never trips its threshold.
+    """
+    settings = get_system_settings_bulk(STATUS_SETTINGS)
+    fan_on = False
+    pump_on = False
+    if reading:
+        # Fan turns on above the temperature/humidity maximums
+        fan_on = (
+            (reading.temperature is not None and reading.temperature > settings[('temperature', 'max')]) or
+            (reading.humidity is not None and reading.humidity > settings[('humidity', 'max')])
+        )
+        # Pump turns on below the moisture minimum
+        pump_on = reading.moisture is not None and reading.moisture < settings[('moisture', 'min')]
+
+    # The bulk lookup above cached the light schedule, so this is a cache hit
+    return lights_on_now(), fan_on, pump_on
+
+def _parse_setting_value(value):
+    """
+    Decode a stored setting into its Python value.
+    
+    Settings are stored JSON-encoded, so numbers, booleans and strings come
+    back with the type they were saved with.
+    
+    Args:
+        value (str): Raw value from the system_settings table
+    
+    Returns:
+        The decoded value. Rows written before values were JSON-encoded
+        are converted by create_tables(); until that has run, any that are
+        not valid JSON (e.g. '06:00') are returned as-is.
+    """
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
 
 @main.route('/current-readings')
 @login_required
@@ -393,39 +777,37 @@ def current_readings():
     - Current status of fan (on/off based on temperature/humidity thresholds)
     - Current status of pump (on/off based on moisture threshold)
     
-    Returns HTML partial for updating the dashboard.
+    Returns HTML partial for updating the dashboard. The rendered HTML is
+    reused until the reading or one of the statuses changes, and carries
+    an ETag so unchanged polls are answered with 304 Not Modified.
     Requires user authentication.
     """
     # Get the latest sensor reading
-    reading = SensorReading.query.order_by(SensorReading.timestamp.desc()).first()
-
-    # Get light schedule from settings
-    light_on_time = get_system_setting('light', 'on_time', default='06:00')
-    light_off_time = get_system_setting('light', 'off_time', default='20:00')
-    fan_on_temp = get_system_setting('temperature', 'max', default=75)  # Turn on when above this
-    fan_on_humidity = get_system_setting('humidity', 'max', default=70)
-    pump_on_moisture = get_system_setting('moisture', 'min', default=30)  # Turn on when below this
-
-    # Convert current time and settings to comparable format
-    current_time = datetime.now().strftime('%H:%M')
+    reading = latest_reading()
 
-    fan_on = False
-    pump_on = False
-    if reading:
-        fan_on = (reading.temperature > fan_on_temp) or (reading.humidity > fan_on_humidity)
-        pump_on = reading.moisture < pump_on_moisture
-    
-    # Check if lights should be on
-    if light_on_time <= light_off_time:
-        lights_on = light_on_time <= current_time <= light_off_time
-    else:
-        lights_on = current_time >= light_on_time or current_time <= light_off_time
-
-    return render_template('partials/current_readings.html',
-                        reading=reading,
-                        lights_on=lights_on,
-                        fan_on=fan_on,
-                        pump_on=pump_on)
+    # Get statuses for indicators fan, lights, and pump
+    lights_on, fan_on, pump_on = device_status(reading)
+
+    # The partial depends only on these inputs, so re-render only when one
+    # of them changes; polls in between reuse the last HTML
+    global _readings_partial
+    key = (reading.id if reading else None, lights_on, fan_on, pump_on)
+    if _readings_partial[0] != key:
+        html = render_template('partials/current_readings.html',
+                            reading=reading,
+                            lights_on=lights_on,
+                            fan_on=fan_on,
+                            pump_on=pump_on)
+        _readings_partial = (key, html, '%s-%d%d%d' % key)
+    _, html, etag = _readings_partial
+
+    # Polls revalidate with If-None-Match and get an empty 304 while
+    # nothing has changed; the browser hands htmx its cached copy
+    response = Response(html, mimetype='text/html')
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.set_etag(etag)
+    return response.make_conditional(request)
 
 @main.route('/api/chart-data')
 @login_required
@@ -437,43 +819,101 @@ def chart_data():
     data overload in the chart.
     
     Processing:
-    - Gets all readings within 48-hour window
-    - Groups by hour, selecting one reading per hour
-    - Formats timestamps for chart display
-    - Extracts temperature and humidity data series
-    
-    Returns JSON response with data structured for charting library.
+    - Buckets readings within the 48-hour window by hour (see
+      hourly_averages)
+    - Averages temperature and humidity per hour, so at most 48 rows
+      are returned
+    - Extracts timestamp, temperature and humidity data series
+    
+    Returns JSON response with data structured for charting library,
+    with an ETag and a short max-age so repeat fetches can be answered
+    with 304 Not Modified.
     Requires user authentication.
     """
-    # Get readings from the last 48 hours
+    # Get readings from the last 48 hours. The window starts on a whole
+    # hour, so its contents only change when a reading is added or the
+    # hour rolls over.
     end_time = datetime.utcnow()
-    start_time = end_time - timedelta(hours=48)
-
-    # Get a list of all readings in the time period
-    all_readings = SensorReading.query.filter(
-        SensorReading.timestamp.between(start_time, end_time)
-    ).order_by(SensorReading.timestamp.asc()).all()
-
-    # Group readings by hour and select one reading per hour
-    hourly_readings = {}
-    for reading in all_readings:
-        # Create a key for each hour
-        hour_key = reading.timestamp.strftime('%Y-%m-%d %H')
-
-        # Store only the first reading for each hour
-        if hour_key not in hourly_readings:
-            hourly_readings[hour_key] = reading
-
-    # Convert to a sorted list
-    readings = [hourly_readings[key] for key in sorted(hourly_readings.keys())]
-
-    # Prepare data for the chart
-    timestamps = [reading.timestamp.strftime('%Y-%m-%d %H:%M') for reading in readings]
-    temperature_data = [reading.temperature for reading in readings]
-    humidity_data = [reading.humidity for reading in readings]
-
-    return jsonify({
-        'timestamps': timestamps,
-        'temperature': temperature_data,
-        'humidity': humidity_data
-    })
+    start_time = (end_time - timedelta(hours=47)).replace(minute=0, second=0, microsecond=0)
+
+    # The ETag is built from those two inputs, so an unchanged chart is
+    # answered with 304 before anything is aggregated or serialized
+    reading = latest_reading()
+    etag = '%s-%s' % (reading.id if reading else 0, start_time.strftime('%Y%m%d%H'))
+
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        hourly_readings = hourly_averages(start_time, end_time)
+
+        # Prepare data for the chart, transposing the rows into three series
+        if hourly_readings:
+            timestamps, temperature_data, humidity_data = map(list, zip(*hourly_readings))
+        else:
+            timestamps, temperature_data, humidity_data = [], [], []
+
+        response = jsonify({
+            'timestamps': timestamps,
+            'temperature': temperature_data,
+            'humidity': humidity_data
+        })
+
+    # Let the browser reuse the data briefly, then revalidate with
+    # If-None-Match
+    response.cache_control.private = True
+    response.cache_control.max_age = CHART_DATA_MAX_AGE
+    response.set_etag(etag)
+    return response
+
+def hourly_averages(start_time, end_time):
+    """
+    Average temperature and humidity per hour between two times.
+    
+    On SQLite and PostgreSQL the database groups readings into hourly
+    buckets, so at most one row per hour is returned. Other databases fall
+    back to streaming the raw readings in batches with yield_per and
+    folding them into per-hour sums, which keeps memory bounded by the
+    number of hours rather than the number of readings.
+    
+    Args:
+        start_time (datetime): Start of the window (inclusive)
+        end_time (datetime): End of the window (inclusive)
+    
+    Returns:
+        list: (hour, avg_temperature, avg_humidity) tuples ordered by hour,
+        where hour is a 'YYYY-MM-DD HH:00' string
+    """
+    in_window = SensorReading.timestamp.between(start_time, end_time)
+    dialect = db.engine.dialect.name
+
+    if dialect in _HOUR_BUCKETS:
+        # Let the database group readings into hourly buckets
+        hour = _HOUR_BUCKETS[dialect](SensorReading.timestamp).label('hour')
+        return db.session.execute(
+            select(
+                hour,
+                func.avg(SensorReading.temperature),
+                func.avg(SensorReading.humidity)
+            ).where(in_window).group_by(hour).order_by(hour)
+        ).all()
+
+    # hour (datetime) -> [temperature sum, humidity sum, count]
+    buckets = {}
+    rows = db.session.execute(
+        select(SensorReading.timestamp, SensorReading.temperature, SensorReading.humidity)
+        .where(in_window)
+        .execution_options(yield_per=1000)
+    )
+    for timestamp, temperature, humidity in rows:
+        # Key on the truncated datetime; only the final buckets get formatted
+        hour = timestamp.replace(minute=0, second=0, microsecond=0)
+        bucket = buckets.get(hour)
+        if bucket is None:
+            bucket = buckets[hour] = [0.0, 0.0, 0]
+        bucket[0] += temperature
+        bucket[1] += humidity
+        bucket[2] += 1
+    return [
+        (hour.strftime('%Y-%m-%d %H:00'), temp_sum / count, humidity_sum / count)
+        for hour, (temp_sum, humidity_sum, count) in sorted(buckets.items())
+    ]
@@ -0,0 +1,46 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Settings forms marked with data-async-settings are saved with a JSON
+    // POST and updated in place, instead of a full submit/redirect/reload.
+    // Without JavaScript the forms still submit normally.
+    document.querySelectorAll('form[data-async-settings]').forEach(function(form) {
+        form.addEventListener('submit', function(event) {
+            event.preventDefault();
+
+            // Collect the form fields (including csrf_token) as JSON
+            const payload = {};
+            new FormData(form).forEach((value, key) => { payload[key] = value; });
+
+            fetch(form.action || window.location.pathname, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(payload)
+            })
+                .then(response => response.json())
+                .then(data => showResult(form, data))
+                .catch(error => console.error('Error saving settings:', error));
+        });
+    });
+
+    // Replace any previous messages with the outcome of this save
+    function showResult(form, data) {
+        form.querySelectorAll('.js-settings-message').forEach(el => el.remove());
+
+        if (data.errors) {
+            Object.entries(data.errors).forEach(([name, messages]) => {
+                const field = form.querySelector(`[name="${name}"]`);
+                if (field) {
+                    field.insertAdjacentElement('afterend', alertElement('danger', messages[0]));
+                }
+            });
+            return;
+        }
+        form.insertAdjacentElement('afterbegin', alertElement('success', data.message));
+    }
+
+    function alertElement(category, message) {
+        const alert = document.createElement('div');
+        alert.className = `alert alert-${category} js-settings-message`;
+        alert.textContent = message;
+        return alert;
+    }
+});
@@ -0,0 +1,50 @@
+"""
+Readings Signal
+
+Lets the sensor service tell the web app that new readings were committed.
+The sensor service bumps the mtime of a shared file after each commit and
+the web app compares it on every request, so no broker or open connection
+is needed between the processes.
+"""
+
+import os
+from flask import current_app
+
+_signal_dir_ready = False  # Whether the signal file's directory has been created
+
+def readings_signal_path():
+    """
+    Path of the file the sensor service touches after committing readings.
+
+    Defaults to readings.signal in the instance folder, which the web app
+    and the sensor service share; READINGS_SIGNAL_FILE overrides it.
+    """
+    return (current_app.config.get('READINGS_SIGNAL_FILE') or
+            os.path.join(current_app.instance_path, 'readings.signal'))
+
+def notify_new_readings():
+    """
+    Tell web workers that new sensor readings were committed.
+
+    Failures are logged and otherwise ignored, as the web side then falls
+    back to its cache TTL.
+    """
+    global _signal_dir_ready
+    path = readings_signal_path()
+    try:
+        if not _signal_dir_ready:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            _signal_dir_ready = True
+        with open(path, 'a'):
+            os.utime(path)
+    except OSError as e:
+        current_app.logger.warning("Could not update readings signal file %s: %s", path, e)
+
+def readings_signal_stamp():
+    """
+    Modification time of the readings signal file, or None if it is missing.
+    """
+    try:
+        return os.stat(readings_signal_path()).st_mtime_ns
+    except OSError:
+        return None
@@ -6,12 +6,17 @@ A background process that continuously reads data from environmental sensors
 and stores readings in the database for the smart garden system.
 """
 
+import signal
+import sys
 import time
+from datetime import datetime
 import board
 import adafruit_scd4x
 import logging
+from sqlalchemy import insert
 from app.models import SensorReading
 from app import create_app, db
+from app.utils.readings_signal import notify_new_readings
 from app.utils.soil_sensor import SoilSensor
 
 # Initialize the Flask application
@@ -24,10 +29,66 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of readings to collect before writing them in one transaction.
+# Each commit is an fsync on the SD card; at one reading per 30 seconds a
+# batch of 2 still lands new data in the database every minute.
+COMMIT_BATCH_SIZE = 2
+
+# Seconds between stored readings. The SCD41 measures every 5 seconds in
+# periodic mode, so by the time a sample is due data_ready is normally
+# already set and the sensor is only polled once per reading.
+SAMPLE_INTERVAL = 30
+DATA_READY_POLL = 0.1     # Seconds between data_ready checks while waiting
+DATA_READY_TIMEOUT = 6    # Give up on a sample after one missed measurement period
+ERROR_RETRY_DELAY = 5     # Seconds to wait before retrying after an error
+
+# Consecutive failed commits after which the queued batch is dropped, so a
+# persistent database error or a bad row cannot grow the queue without bound
+MAX_COMMIT_ATTEMPTS = 3
+
 # Push an application context
 # This is required to use Flask's database functions outside of a request context
 app.app_context().push()
 
+# Readings waiting to be committed in the next batch
+pending_readings = []
+failed_commits = 0  # Consecutive failed attempts to commit pending_readings
+
+def commit_pending_readings():
+    """
+    Write all queued readings with one executemany INSERT and a single commit.
+    
+    On failure the batch is kept for the next attempt, and dropped (with an
+    error logged) once MAX_COMMIT_ATTEMPTS commits in a row have failed.
+    """
+    global failed_commits
+    if not pending_readings:
+        return
+    try:
+        # Plain Core insert, without building ORM objects
+        db.session.execute(insert(SensorReading), pending_readings)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        failed_commits += 1
+        if failed_commits >= MAX_COMMIT_ATTEMPTS:
+            logger.error("Dropping %d readings after %d failed commits: %s",
+                         len(pending_readings), failed_commits, str(e))
+            pending_readings.clear()
+            failed_commits = 0
+        else:
+            logger.error("Failed to commit %d readings (attempt %d of %d): %s",
+                         len(pending_readings), failed_commits, MAX_COMMIT_ATTEMPTS, str(e))
+        return
+    pending_readings.clear()
+    failed_commits = 0
+    # Let the web app drop its cached latest reading now
+    notify_new_readings()
+
+# systemd stops the service with SIGTERM; turn it into SystemExit so the
+# shutdown path below runs and the last partial batch is written
+signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
 try:
     # Initialize SCD41 sensor
     # The SCD41 is a high-precision CO2, temperature, and humidity sensor
@@ -45,10 +106,27 @@ try:
     scd4x.start_periodic_measurement()
     logger.info("Waiting for first measurement....")
     
+    # Sample on a fixed schedule rather than sleeping a fixed time after each
+    # reading, so the time spent reading and committing does not drift it
+    next_sample = time.monotonic()
+    
     # Main monitoring loop
     while True:
         try:
-            if scd4x.data_ready:
+            time.sleep(max(0, next_sample - time.monotonic()))
+            # Skip missed slots instead of taking several readings back to back
+            next_sample = max(next_sample + SAMPLE_INTERVAL, time.monotonic())
+            
+            # Briefly poll in case the sensor is mid-measurement
+            deadline = time.monotonic() + DATA_READY_TIMEOUT
+            data_ready = scd4x.data_ready
+            while not data_ready and time.monotonic() < deadline:
+                time.sleep(DATA_READY_POLL)
+                data_ready = scd4x.data_ready
+            
+            if not data_ready:
+                logger.warning("No SCD41 measurement ready, skipping this sample")
+            else:
                 # Read SCD41 sensor data when new data is available
                 co2 = scd4x.CO2  # Carbon dioxide level in parts per million (ppm)
                 temperature = scd4x.temperature * (9 / 5) + 32  # Convert temperature from Celsius to Fahrenheit
@@ -58,15 +136,18 @@ try:
                 # Returns a percentage value representing soil moisture content
                 moisture = soil_sensor.read_sensor()
                 
-                # Create new reading with all sensor data and store in database
-                reading = SensorReading(
-                    co2=co2,
-                    temperature=temperature,
-                    humidity=humidity,
-                    moisture=moisture
-                )
-                db.session.add(reading)  # Add the new reading to the database session
-                db.session.commit()  # Commit the transaction to permanently store the reading
+                # Queue the reading for the next batch; the timestamp is taken
+                # now rather than left to the column default, which would
+                # stamp every row in the batch with the commit time
+                pending_readings.append({
+                    'timestamp': datetime.utcnow(),
+                    'co2': co2,
+                    'temperature': temperature,
+                    'humidity': humidity,
+                    'moisture': moisture
+                })
+                if len(pending_readings) >= COMMIT_BATCH_SIZE:
+                    commit_pending_readings()
                 
                 # Log the measurements for monitoring and debugging
                 logger.info(
@@ -74,16 +155,12 @@ try:
                     co2, temperature, humidity, moisture if moisture is not None else "N/A"
                 )
             
-            # Wait 30 seconds before taking the next reading
-            # This helps avoid excessive database writes and allows sensors time to stabilize
-            time.sleep(30)
-            
         except Exception as e:
             # Error handling for individual measurements
             # This prevents the entire monitoring process from crashing if a single reading fails
             logger.error("Error during measurement: %s", str(e))
-            db.session.rollback()  # Rollback the database session on error to prevent partial commits
-            time.sleep(5)  # Wait a bit before retrying to avoid rapid error loops
+            db.session.rollback()  # Rollback the database session on error
+            next_sample = time.monotonic() + ERROR_RETRY_DELAY  # Wait a bit before retrying to avoid rapid error loops
             
 except Exception as e:
     # Top-level error handling for fatal errors that break out of the main loop
@@ -95,3 +172,7 @@ except Exception as e:
         
     # Re-raise the exception to signal the error to the process manager
     raise
+
+finally:
+    # Write the last partial batch on shutdown or a fatal error
+    commit_pending_readings()
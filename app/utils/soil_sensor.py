@@ -1,8 +1,14 @@
 import time
 import serial
-import json
 import logging
 
+try:
+    # orjson parses faster and allocates less than the stdlib json module,
+    # which adds up in this long-running loop
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -10,6 +16,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Longest wait, in seconds, between attempts to reopen a failed port. The
+# delay doubles after each failed attempt up to this limit.
+MAX_RECONNECT_DELAY = 300
+
 class SoilSensor:
     """
     A class to interface with a soil moisture sensor connected via serial.
@@ -36,23 +46,36 @@ class SoilSensor:
         self.baudrate = baudrate
         self.serial = None
         self.last_reading = None
+        self._buffer = bytearray()  # Bytes received after the last complete line
+        self._failed_connects = 0   # Consecutive failed connection attempts
+        self._retry_at = 0          # Monotonic time before which connect is not retried
     
     def connect(self):
         """
         Establish a connection to the soil moisture sensor.
         
         Attempts to open a serial connection with the specified port and baudrate.
+        Anything queued before the connection was made is discarded. After a
+        failure, read_sensor waits before retrying, doubling the delay each
+        time up to MAX_RECONNECT_DELAY.
         
         Returns:
             bool: True if connection successful, False otherwise.
         """
         try:
-            self.serial = serial.Serial(self.port, self.baudrate, timeout=1)
-            logger.info("Successfully connected to soil moisture sensor")
-            return True
+            port = serial.Serial(self.port, self.baudrate, timeout=1)
+            port.reset_input_buffer()
         except Exception as e:
-            logger.error(f"Failed to connect to soil moisture sensor: {e}")
+            self._failed_connects += 1
+            delay = min(MAX_RECONNECT_DELAY, 2 ** self._failed_connects)
+            self._retry_at = time.monotonic() + delay
+            logger.error(f"Failed to connect to soil moisture sensor: {e} (retrying in {delay}s)")
             return False
+        self.serial = port
+        self._buffer.clear()
+        self._failed_connects = 0
+        logger.info("Successfully connected to soil moisture sensor")
+        return True
     
     def read_sensor(self):
         """
@@ -61,20 +84,46 @@ class SoilSensor:
         Attempts to connect if not already connected, then reads and
         parses JSON data from the serial port.
         
+        The sensor streams a line continuously, far faster than it is read,
+        so everything queued since the last call is drained and only the
+        newest complete line is parsed. Older lines are discarded and a
+        trailing partial line is kept for the next call.
+        
+        The port is kept open between reads. If it fails (for example the
+        board was unplugged) it is closed and reopened on a later call.
+        
         Returns:
             float: The moisture reading if successful, None otherwise.
         """
         if not self.serial:
-            if not self.connect():
+            if time.monotonic() < self._retry_at or not self.connect():
                 return None
         try:
             if self.serial.in_waiting:
-                line = self.serial.readline().decode('utf-8').strip()
-                data = json.loads(line)
+                buffer = self._buffer
+                buffer += self.serial.read(self.serial.in_waiting)
+                if b'\n' not in buffer:
+                    # Only part of a line has arrived; wait (up to the port
+                    # timeout) for the rest of it
+                    buffer += self.serial.readline()
+                end = buffer.rfind(b'\n')
+                if end == -1:
+                    return None
+                lines = buffer[:end].split(b'\n')
+                del buffer[:end + 1]
+                # Both parsers accept the UTF-8 bytes directly
+                line = next((l for l in reversed(lines) if l.strip()), b'')
+                data = json_loads(line)
                 self.last_reading = data.get('moisture')
                 logger.debug(f"Read moisture value: {self.last_reading}")
                 return self.last_reading
+        except (serial.SerialException, OSError) as e:
+            # The port itself failed; drop it so the next read reconnects
+            logger.error(f"Soil moisture sensor connection lost: {e}")
+            self.cleanup()
+            return None
         except Exception as e:
+            self._buffer.clear()
             logger.error(f"Error reading soil moisture sensor: {e}")
             return None
     
@@ -95,5 +144,10 @@ class SoilSensor:
         release system resources.
         """
         if self.serial:
-            self.serial.close()
+            try:
+                self.serial.close()
+            except Exception:
+                pass
+            self.serial = None
+            self._buffer.clear()
             logger.info("Closed soil moisture sensor connection")
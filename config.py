@@ -14,3 +14,29 @@ class Config:
     SESSION_COOKIE_SAMESITE = 'Lax'
 
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
+
+    # Templates only change on deploy, so don't stat them on every render;
+    # set TEMPLATES_AUTO_RELOAD=true while editing templates
+    TEMPLATES_AUTO_RELOAD = os.environ.get('TEMPLATES_AUTO_RELOAD', 'false').lower() == 'true'
+    JINJA_BYTECODE_CACHE = True
+
+    # Run db.create_all() inside create_app; the `flask init-db` command
+    # does the same on demand
+    AUTO_CREATE_TABLES = True
+
+    # Serve the live camera stream at /video_feed; set CAMERA_ENABLED=false
+    # on headless deployments
+    CAMERA_ENABLED = os.environ.get('CAMERA_ENABLED', 'true').lower() != 'false'
+
+    # Streams each occupy a server thread; keep this below the gunicorn
+    # --threads count so dashboard polls are never starved
+    MAX_STREAM_VIEWERS = 4
+
+    # File the sensor service touches after each commit so the web app
+    # refreshes its cached reading; defaults to instance/readings.signal
+    READINGS_SIGNAL_FILE = os.environ.get('READINGS_SIGNAL_FILE')
+
+class ServiceConfig(Config):
+    # Background services that only read existing tables skip the
+    # CREATE TABLE checks on every start
+    AUTO_CREATE_TABLES = False
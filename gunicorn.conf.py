@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for the Smart Garden web app.
+
+Gunicorn reads this file automatically when started from the project
+directory:
+
+    gunicorn run:app
+
+One process with a pool of threads: every camera viewer shares the single
+capture loop in that process, and each open video stream holds one thread
+(capped by MAX_STREAM_VIEWERS in config.py) while the rest serve the
+dashboard. gevent workers are not used because OpenCV's blocking frame
+reads would stall the whole event loop.
+"""
+
+bind = '0.0.0.0:5000'
+worker_class = 'gthread'
+workers = 1
+threads = 8
+
+# Video streams stay open indefinitely; gthread workers notify the master
+# from a separate thread, so long responses do not trip the worker timeout
+timeout = 30
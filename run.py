@@ -9,6 +9,7 @@ The application factory pattern is used to create the Flask application
 instance, which allows for better flexibility and testing capabilities.
 """
 
+import os
 from app import create_app, db
 
 # Create the Flask application instance using the factory function
@@ -16,6 +17,6 @@ app = create_app()
 
 if __name__ == '__main__':
     # Run the application only if this file is executed directly
-    # Debug mode is enabled for development purposes
-    # Warning: Debug mode should be disabled in production
-    app.run(debug=True)
+    # Debug mode (reloader and interactive debugger) is opt-in with
+    # FLASK_DEBUG=1; production runs under gunicorn (see gunicorn.conf.py)
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1')